@@ -5,6 +5,7 @@ from enum import Enum
 from graphlib import TopologicalSorter
 from io import StringIO
 from pathlib import Path
+from threading import Lock
 from typing import Final, Mapping, Optional, Sequence, Set, TextIO, Tuple, cast
 
 from docutils.core import publish_doctree
@@ -16,13 +17,25 @@ from sphinx.environment import BuildEnvironment
 from bpystubgen.parser import _known_types
 
 
+_env_lock: Final = Lock()
+
+
 def from_path(source: Path, settings: Values, env: BuildEnvironment) -> Optional[document]:
-    return from_io(source.open("r"), str(source), settings, env)
+    return from_text(source.read_text("utf-8"), str(source), settings, env)
+
+
+def from_text(source: str, source_path: str, settings: Values, env: BuildEnvironment) -> Optional[document]:
+    with _env_lock:
+        env.project.docnames.add(source_path)
+        env.prepare_settings(source_path)
+
+    return publish_doctree(source, source_path=source_path, settings=settings)
 
 
 def from_io(source: TextIO, source_path: str, settings: Values, env: BuildEnvironment) -> Optional[document]:
-    env.project.docnames.add(source_path)
-    env.prepare_settings(source_path)
+    with _env_lock:
+        env.project.docnames.add(source_path)
+        env.prepare_settings(source_path)
 
     doctree = publish_doctree(
         source,
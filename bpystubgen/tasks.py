@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import translate
 from pathlib import Path
-from typing import AbstractSet, Iterable, MutableMapping, Optional, Sequence, ValuesView, cast
+from typing import AbstractSet, Callable, Iterable, Iterator, MutableMapping, Optional, Sequence, Set, Tuple, Union, \
+    cast
 
 from docutils.frontend import Values
 from docutils.io import FileOutput
@@ -15,22 +20,68 @@ from bpystubgen import nodes, patches
 from bpystubgen.nodes import Class, DocString, Import, Module
 
 
+_marker_cache: Set[Path] = set()
+
+_mkdir_cache: Set[Path] = set()
+
+
+def _collect(doctree: document) -> Tuple[Tuple[Class, ...], Tuple[Module, ...]]:
+    classes = []
+    modules = []
+
+    stack = list(reversed(doctree.children))
+
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, Class):
+            classes.append(node)
+        elif isinstance(node, Module):
+            modules.append(node)
+
+        children = node.children
+
+        if children:
+            stack.extend(reversed(children))
+
+    return tuple(classes), tuple(modules)
+
+
+def _scandir_rst(root: Union[Path, str], match: Callable[[str], Optional[re.Match]]) -> Iterator[os.DirEntry]:
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_rst(entry.path, match)
+            elif entry.is_file(follow_symlinks=False) and match(entry.name):
+                yield entry
+
+
 class Task:
 
+    __slots__ = ("_name", "_parent", "_children", "_children_tuple", "_full_name")
+
+    _kind = 0
+
     @classmethod
     def create(cls, src_dir: Path, pattern: str = "*.rst") -> Task:
         root = Task()
+        resolved: MutableMapping[Tuple[str, ...], Task] = dict()
 
-        def resolve(path: Sequence[str], context: Task) -> Task:
-            count = len(path)
+        def resolve(path: Sequence[str]) -> Task:
+            assert len(path) > 0
 
-            assert count > 0
+            key = tuple(path)
+            child = resolved.get(key)
 
-            name = path[0]
+            if child:
+                return child
 
-            if name in context.keys():
-                child = context[name]
-            else:
+            context = root if len(path) == 1 else resolve(path[:-1])
+            name = path[-1]
+
+            child = context._children.get(name)
+
+            if not child:
                 full_name = ".".join((context.full_name, name))
 
                 if name[0].isupper() or full_name in bpystubgen.lowercase_class_names:
@@ -38,19 +89,21 @@ class Task:
                 else:
                     child = ModuleTask(name, parent=context)
 
-            if count == 1:
-                return child
+            resolved[key] = child
+
+            return child
 
-            return resolve(path[1:], child)
+        match = re.compile(translate(pattern)).match
 
-        for file in sorted(src_dir.rglob(pattern)):
-            segments = file.name.split(".")[:-1]
+        for entry in sorted(_scandir_rst(src_dir, match), key=lambda e: e.path):
+            segments = entry.name.split(".")[:-1]
 
             if ".".join(segments) in patches.blacklist:
                 continue
 
-            task = resolve(segments, root)
-            task.source = file
+            task = resolve(segments)
+
+            cast(ParserTask, task).source = Path(entry.path)
 
         return root
 
@@ -58,14 +111,13 @@ class Task:
         self._name = name
         self._parent = parent
         self._children: MutableMapping[str, Task] = dict()
+        self._children_tuple: Optional[Tuple[Task, ...]] = None
 
         if parent:
             parent._children[self.name] = self
+            parent._children_tuple = None
 
-            segments = list(filter(any, map(lambda a: a.name, self.ancestors)))
-            segments.append(self.name)
-
-            self._full_name = ".".join(segments)
+            self._full_name: str = ".".join((parent._full_name, name)) if parent._full_name else name
         else:
             self._full_name = name
 
@@ -83,23 +135,55 @@ class Task:
 
     @property
     def ancestors(self) -> Iterable[Task]:
-        if self.parent:
-            yield from self.parent.ancestors
-            yield self.parent
+        chain = []
+        parent = self._parent
+
+        while parent:
+            chain.append(parent)
+            parent = parent._parent
+
+        return reversed(chain)
+
+    def parse_all(self, settings: Values, env: BuildEnvironment, max_workers: Optional[int] = None) -> None:
+        tasks = tuple(self)
+        classes = tuple(t for t in tasks if isinstance(t, ClassTask) and t.source)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = tuple(map(lambda t: executor.submit(t.parse, settings.copy(), env), classes))
+
+            for future in futures:
+                future.result()
+
+        for task in tasks:
+            if isinstance(task, ModuleTask):
+                task.parse(settings, env)
 
     def keys(self) -> AbstractSet[str]:
         return self._children.keys()
 
-    def values(self) -> ValuesView[Task]:
-        return self._children.values()
+    def values(self) -> Tuple[Task, ...]:
+        if self._children_tuple is None:
+            self._children_tuple = tuple(self._children.values())
+
+        return self._children_tuple
 
     def __getitem__(self, key: str) -> Task:
         return self._children[key]
 
-    def __iter__(self) -> Iterable[Task]:
-        for child in self.values():
-            yield from child.__iter__()
-            yield child
+    def __iter__(self) -> Iterator[Task]:
+        stack = [(self, iter(self.values()))]
+
+        while stack:
+            task, children = stack[-1]
+            child = next(children, None)
+
+            if child:
+                stack.append((child, iter(child.values())))
+            else:
+                stack.pop()
+
+                if task is not self:
+                    yield task
 
     def __len__(self) -> int:
         return len(self._children)
@@ -113,29 +197,71 @@ class Task:
 
 class ParserTask(Task):
 
+    __slots__ = ("_source", "_source_path", "doctree", "_classes", "_modules")
+
     def __init__(self, name: str = "", parent: Optional[Task] = None) -> None:
         super().__init__(name, parent)
 
-        self.source: Optional[Path] = None
+        self._source: Optional[Path] = None
+        self._source_path: Optional[str] = None
         self.doctree: Optional[document] = None
 
+        self._classes: Optional[Tuple[Class, ...]] = None
+        self._modules: Optional[Tuple[Module, ...]] = None
+
+    @property
+    def source(self) -> Optional[Path]:
+        return self._source
+
+    @source.setter
+    def source(self, value: Optional[Path]) -> None:
+        self._source = value
+        self._source_path = str(value) if value else None
+
+    @property
+    def classes(self) -> Tuple[Class, ...]:
+        if self._classes is None:
+            self._classes, self._modules = _collect(self.doctree) if self.doctree else ((), ())
+
+        return self._classes
+
+    @property
+    def modules(self) -> Tuple[Module, ...]:
+        if self._modules is None:
+            self._classes, self._modules = _collect(self.doctree) if self.doctree else ((), ())
+
+        return self._modules
+
     def parse(self, settings: Values, env: BuildEnvironment) -> Optional[document]:
-        if self.source:
-            doc = nodes.from_path(self.source, settings, env)
+        source = self._source
+        source_path = self._source_path
+
+        if source and source_path:
+            doc = nodes.from_text(source.read_text("utf-8"), source_path, settings, env)
 
             self.doctree = patches.apply(self.name, doc, settings, env)
         else:
             self.doctree = None
 
+        self._classes = None
+        self._modules = None
+
         return self.doctree
 
 
 class ClassTask(ParserTask):
-    pass
+
+    __slots__ = ()
+
+    _kind = 1
 
 
 class ModuleTask(ParserTask):
 
+    __slots__ = ()
+
+    _kind = 2
+
     def parse(self, settings: Values, env: BuildEnvironment) -> Optional[document]:
         doctree = super().parse(settings, env)
 
@@ -145,9 +271,14 @@ class ModuleTask(ParserTask):
 
         self.doctree = doctree
 
-        try:
-            module = next(iter(doctree.traverse(Module)))
-        except StopIteration:
+        module = None
+
+        for child in doctree.children:
+            if isinstance(child, Module):
+                module = child
+                break
+
+        if not module:
             module = Module(name=self.full_name)
 
             docstring = DocString()
@@ -165,11 +296,19 @@ class ModuleTask(ParserTask):
         for cls in module.traverse(Class):
             patches.apply(cls.full_name, cls, settings, env)
 
-        classes = filter(lambda c: isinstance(c, ClassTask) and c.doctree, self.values())
-        submodules = filter(lambda c: isinstance(c, ModuleTask) and c.doctree, self.values())
+        classes = []
+        submodules = []
+
+        for child in self.values():
+            kind = child._kind
+
+            if kind == 1 and cast(ClassTask, child).doctree:
+                classes.append(child)
+            elif kind == 2 and cast(ModuleTask, child).doctree:
+                submodules.append(child)
 
         for child in classes:
-            for node in cast(ClassTask, child).doctree.traverse(Class):
+            for node in cast(ClassTask, child).classes:
                 node.parent.remove(node)
                 module += node
 
@@ -177,16 +316,18 @@ class ModuleTask(ParserTask):
         module.sort_members()
 
         index = 1 if module.docstring else 0
+        insert = module.insert
+        localise_name = module.localise_name
 
         for child in submodules:
-            for node in cast(ModuleTask, child).doctree.traverse(Module):
-                module.insert(index, Import(module=".", types=module.localise_name(node.name)))
+            for node in cast(ModuleTask, child).modules:
+                insert(index, Import(module=".", types=localise_name(cast(str, node.name))))
 
         return doctree
 
     def target_path(self, dest_dir: Path) -> Path:
         top_level = not self.parent or not any(self.parent.ancestors)
-        has_submodule = any(filter(lambda c: isinstance(c, ModuleTask), self.values()))
+        has_submodule = any(c._kind == 2 for c in self.values())
 
         if top_level or has_submodule:
             parent_dir = Path(dest_dir, "/".join(self.full_name.split("."))).resolve()
@@ -198,12 +339,13 @@ class ModuleTask(ParserTask):
     def generate(self, dest_dir: Path, writer: Writer) -> Optional[Path]:
         target = self.target_path(dest_dir)
 
-        target.parent.mkdir(parents=True, exist_ok=True)
-
-        marker = target.parent / "py.typed"
+        if target.parent not in _mkdir_cache:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _mkdir_cache.add(target.parent)
 
-        with open(marker, "w"):
-            pass
+        if target.parent not in _marker_cache:
+            (target.parent / "py.typed").touch(exist_ok=True)
+            _marker_cache.add(target.parent)
 
         fout = FileOutput(destination_path=str(target), encoding="utf-8")
 
@@ -1,5 +1,31 @@
 from setuptools import setup
 
+def native_modules():
+    try:
+        from mypyc.build import mypycify
+
+        return mypycify(["--follow-imports=silent", "bpystubgen/tasks.py"])
+    except KeyboardInterrupt:
+        raise
+    except BaseException:
+        # mypyc aborts with SystemExit when type checking fails; fall back
+        # to the Cython or pure-Python build rather than breaking install.
+        pass
+
+    try:
+        from Cython.Build import cythonize
+
+        return cythonize(
+            ["bpystubgen/tasks.py", "bpystubgen/nodes.py"],
+            language_level=3)
+    except KeyboardInterrupt:
+        raise
+    except BaseException:
+        return []
+
+
+ext_modules = native_modules()
+
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
@@ -13,6 +39,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/mysticfall/bpystubgen",
     packages=["bpystubgen"],
+    ext_modules=ext_modules,
     package_data={"bpystubgen": ["patches/*.txt", "patches/*.rst", "patches/__init__.py"]},
     install_requires=["docutils==0.17.1", "sphinxcontrib-restbuilder==0.3"],
     classifiers=[
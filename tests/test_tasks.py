@@ -214,6 +214,23 @@ def test_parse_module(rst_path: Path, settings: Values, app: Sphinx):
     assert dict(map(lambda i: (i.module, i.types), imports)) == {".": ("types",), "typing": ()}
 
 
+def test_parse_all(rst_path: Path, settings: Values, app: Sphinx):
+    root = Task.create(rst_path, "bge.types.*")
+
+    root.parse_all(settings, app.env)
+
+    types = root["bge"]["types"]
+
+    assert isinstance(types, ModuleTask)
+    assert types.doctree
+
+    module = next(iter(types.doctree.traverse(Module)))
+
+    assert len(module.members) == 3
+    assert set(map(lambda c: c.name, module.traverse(Class))) == \
+           {"KX_GameObject", "KX_PythonComponent", "KX_Scene"}
+
+
 def test_target_path(rst_path: Path):
     dest_dir = Path("/target")
     modules = Task.create(rst_path)